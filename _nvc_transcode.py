@@ -0,0 +1,137 @@
+""" In-process NVDEC -> NVENC video transcoding using NVIDIA's PyNvCodec bindings. """
+import collections
+import queue
+import re
+import struct
+import threading
+
+try:
+    import numpy as np
+    import PyNvCodec as nvc
+except ImportError:
+    nvc = None
+
+# No B-frames, so NVENC emits packets in input order and each one takes the next source timestamp.
+ENCODER_SETTINGS = {"codec": "hevc", "preset": "P4", "tuning_info": "high_quality", "bitrate": "15M", "bf": "0"}
+# Decoded frames buffered between the NVDEC and NVENC threads.
+SURFACE_QUEUE_DEPTH = 4
+# Matroska ticks in nanoseconds; 1 ms is the Matroska default and what MakeMKV writes.
+MKV_TIMESTAMP_SCALE = 1000000
+MKV_UNKNOWN_SIZE = b'\x01\xff\xff\xff\xff\xff\xff\xff'
+_HEVC_START_CODE = re.compile(b'\x00\x00\x01(.)', re.DOTALL)
+
+def is_available():
+    return nvc is not None
+
+def _surface_transfer(width, height, decode_gpu, encode_gpu):
+    """ Returns functions moving decoded surfaces into the queue and from the queue to the encoder's GPU. """
+    if decode_gpu == encode_gpu:
+        # The decoder reuses its output surface, so queue a copy (still in GPU memory).
+        return (lambda surface: surface.Clone(decode_gpu)), (lambda surface: surface)
+    downloader = nvc.PySurfaceDownloader(width, height, nvc.PixelFormat.NV12, decode_gpu)
+    uploader = nvc.PyFrameUploader(width, height, nvc.PixelFormat.NV12, encode_gpu)
+
+    def download(surface):
+        frame = np.ndarray(shape=(0,), dtype=np.uint8)
+        downloader.DownloadSingleSurface(surface, frame)
+        return frame
+    return download, uploader.UploadSingleFrame
+
+def _ebml(element_id, payload):
+    if isinstance(payload, int):
+        payload = payload.to_bytes(max(1, (payload.bit_length() + 7) // 8), 'big')
+    elif isinstance(payload, str):
+        payload = payload.encode('ascii')
+    return element_id + b'\x01' + len(payload).to_bytes(7, 'big') + payload
+
+def _is_keyframe(packet):
+    """ True if the Annex B access unit holds an IRAP picture (NAL unit types 16-23). """
+    return any(16 <= (m.group(1)[0] >> 1) & 0x3f <= 23 for m in _HEVC_START_CODE.finditer(packet))
+
+class _MatroskaWriter:
+    """ Writes a single Annex B HEVC track to Matroska, the smallest container FFmpeg takes HEVC timestamps from. """
+
+    def __init__(self, out, width, height):
+        self.out = out
+        self.cluster_ts = None
+        out.write(_ebml(b'\x1a\x45\xdf\xa3', b''.join([
+            _ebml(b'\x42\x86', 1), _ebml(b'\x42\xf7', 1), _ebml(b'\x42\xf2', 4), _ebml(b'\x42\xf3', 8),
+            _ebml(b'\x42\x82', 'matroska'), _ebml(b'\x42\x87', 4), _ebml(b'\x42\x85', 2)])))
+        out.write(b'\x18\x53\x80\x67' + MKV_UNKNOWN_SIZE)
+        out.write(_ebml(b'\x15\x49\xa9\x66', _ebml(b'\x2a\xd7\xb1', MKV_TIMESTAMP_SCALE)))
+        video = _ebml(b'\xe0', _ebml(b'\xb0', width) + _ebml(b'\xba', height))
+        out.write(_ebml(b'\x16\x54\xae\x6b', _ebml(b'\xae', b''.join([
+            _ebml(b'\xd7', 1), _ebml(b'\x73\xc5', 1), _ebml(b'\x83', 1), _ebml(b'\x86', 'V_MPEGH/ISO/HEVC'), video]))))
+
+    def write(self, packet, timestamp):
+        """ Appends one access unit; timestamp is in MKV_TIMESTAMP_SCALE ticks. """
+        if self.cluster_ts is None or not -0x8000 <= timestamp - self.cluster_ts < 0x8000:
+            self.cluster_ts = timestamp
+            self.out.write(b'\x1f\x43\xb6\x75' + MKV_UNKNOWN_SIZE + _ebml(b'\xe7', timestamp))
+        header = struct.pack('>BhB', 0x81, timestamp - self.cluster_ts, 0x80 if _is_keyframe(packet) else 0)
+        self.out.write(_ebml(b'\xa3', header + packet))
+
+def transcode(src, dst, decode_gpu=0, encode_gpu=0, stop=None):
+    """ Decodes src on NVDEC and writes the HEVC stream from NVENC to dst as Matroska, keeping the source timestamps.
+
+    Decoding runs on its own thread so NVDEC works on the next frames while NVENC encodes the current one.
+    Frames stay in GPU memory unless decode and encode run on different GPUs.
+    Setting the optional stop event ends decoding early, e.g. when the conversion is cancelled.
+    Any failure, including PyNvCodec's own exception types, is raised as RuntimeError.
+    """
+    try:
+        _transcode(src, dst, decode_gpu, encode_gpu, stop or threading.Event())
+    except Exception as e:
+        raise RuntimeError(f"Transcoding {src} failed: {e}") from e
+
+def _transcode(src, dst, decode_gpu, encode_gpu, stop):
+    decoder = nvc.PyNvDecoder(src, decode_gpu)
+    width, height = decoder.Width(), decoder.Height()
+    encoder = nvc.PyNvEncoder(dict(ENCODER_SETTINGS, s=f"{width}x{height}"), encode_gpu)
+    enqueue, dequeue = _surface_transfer(width, height, decode_gpu, encode_gpu)
+    # Source timestamps converted to Matroska ticks.
+    tick = decoder.Timebase() * 1e9 / MKV_TIMESTAMP_SCALE
+    surfaces = queue.Queue(maxsize=SURFACE_QUEUE_DEPTH)
+    errors = []
+
+    def decode():
+        try:
+            while not stop.is_set():
+                packet_data = nvc.PacketData()
+                surface = decoder.DecodeSingleSurface(packet_data)
+                if surface.Empty():
+                    break
+                surfaces.put((enqueue(surface), packet_data.pts))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            surfaces.put(None)
+
+    decode_thread = threading.Thread(target=decode, daemon=True)
+    decode_thread.start()
+    packet = np.ndarray(shape=(0,), dtype=np.uint8)
+    timestamps = collections.deque()
+    try:
+        with open(dst, 'wb') as out:
+            writer = _MatroskaWriter(out, width, height)
+            while True:
+                item = surfaces.get()
+                if item is None:
+                    break
+                surface, pts = item
+                timestamps.append(round(pts * tick))
+                if encoder.EncodeSingleSurface(dequeue(surface), packet):
+                    writer.write(packet.tobytes(), timestamps.popleft())
+            while encoder.FlushSinglePacket(packet):
+                writer.write(packet.tobytes(), timestamps.popleft())
+    finally:
+        # If encoding failed, the decode thread may be blocked on a full queue: stop it and drain until it exits.
+        stop.set()
+        while decode_thread.is_alive():
+            try:
+                surfaces.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        decode_thread.join()
+    if errors:
+        raise errors[0]
@@ -0,0 +1,84 @@
+""" Checks the Matroska intermediate written by the in-process NVENC path; needs no NVIDIA hardware. """
+import io
+import struct
+import unittest
+
+import _nvc_transcode
+
+EBML_HEADER = b'\x1a\x45\xdf\xa3'
+SEGMENT = b'\x18\x53\x80\x67'
+CLUSTER = b'\x1f\x43\xb6\x75'
+CLUSTER_TIMESTAMP = b'\xe7'
+SIMPLE_BLOCK = b'\xa3'
+UNKNOWN_SIZE = (1 << 56) - 1
+
+def access_unit(*nal_types):
+    """ A fake Annex B access unit holding one NAL unit of each type. """
+    return b''.join(b'\x00\x00\x00\x01' + bytes([nal_type << 1, 1]) + b'\x55' * 8 for nal_type in nal_types)
+
+def elements(data):
+    """ Flattens the writer's output to (element ID, payload) pairs; unknown-size masters get a None payload. """
+    pos = 0
+    while pos < len(data):
+        id_length = 9 - data[pos].bit_length()
+        element_id = data[pos:pos + id_length]
+        pos += id_length
+        assert data[pos] == 0x01, "the writer always uses 8-byte sizes"
+        size = int.from_bytes(data[pos + 1:pos + 8], 'big')
+        pos += 8
+        if size == UNKNOWN_SIZE:
+            yield element_id, None
+            continue
+        yield element_id, data[pos:pos + size]
+        pos += size
+
+def write(units):
+    out = io.BytesIO()
+    writer = _nvc_transcode._MatroskaWriter(out, 1920, 1080)
+    for packet, timestamp in units:
+        writer.write(packet, timestamp)
+    return list(elements(out.getvalue()))
+
+def blocks(parsed):
+    """ (cluster timestamp, relative timestamp, flags, payload) for each SimpleBlock. """
+    cluster_ts = None
+    for element_id, payload in parsed:
+        if element_id == CLUSTER_TIMESTAMP:
+            cluster_ts = int.from_bytes(payload, 'big')
+        elif element_id == SIMPLE_BLOCK:
+            track, relative, flags = struct.unpack('>BhB', payload[:4])
+            assert track == 0x81
+            yield cluster_ts, relative, flags, payload[4:]
+
+class MatroskaWriterTest(unittest.TestCase):
+    def test_header_and_unknown_size_masters(self):
+        parsed = write([(access_unit(19), 0)])
+        ids = [element_id for element_id, _ in parsed]
+        self.assertEqual(ids[:2], [EBML_HEADER, SEGMENT])
+        self.assertIn(b'\x42\x82\x01' + (8).to_bytes(7, 'big') + b'matroska', parsed[0][1])
+        self.assertIsNone(parsed[1][1])
+        self.assertEqual(ids[-3:], [CLUSTER, CLUSTER_TIMESTAMP, SIMPLE_BLOCK])
+        self.assertIsNone(parsed[-3][1])
+
+    def test_block_timestamps_are_relative_to_cluster(self):
+        unit = access_unit(1)
+        parsed = write([(unit, 1000), (unit, 1042), (unit, 1000 + 0x7fff)])
+        self.assertEqual([(cluster, relative) for cluster, relative, _, _ in blocks(parsed)],
+                         [(1000, 0), (1000, 42), (1000, 0x7fff)])
+        self.assertEqual(next(blocks(parsed))[3], unit)
+
+    def test_new_cluster_past_int16_range(self):
+        unit = access_unit(1)
+        parsed = write([(unit, 0), (unit, 0x8000), (unit, 0x8000 - 5)])
+        self.assertEqual([element_id for element_id, _ in parsed].count(CLUSTER), 2)
+        self.assertEqual([(cluster, relative) for cluster, relative, _, _ in blocks(parsed)],
+                         [(0, 0), (0x8000, 0), (0x8000, -5)])
+
+    def test_keyframe_flag_only_for_irap(self):
+        units = [access_unit(32, 33, 34, 19), access_unit(1), access_unit(21), access_unit(16),
+                 access_unit(23), access_unit(15), access_unit(24), access_unit(32, 33, 34)]
+        parsed = write([(unit, index) for index, unit in enumerate(units)])
+        self.assertEqual([flags for _, _, flags, _ in blocks(parsed)], [0x80, 0, 0x80, 0x80, 0x80, 0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
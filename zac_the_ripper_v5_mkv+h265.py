@@ -1,61 +1,401 @@
 import os
+import re
+import sys
 import subprocess
-import datetime
+import pathlib
 import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import PatternMatchingEventHandler
 import threading
 import logging
+import logging.handlers
+import queue
+import collections
+import contextlib
+import functools
+import concurrent.futures
+import asyncio
+import _nvc_transcode
 
-def smpte_timecode_format():
-    """ Converts current UTC time to SMPTE timecode formatted string. """
-    return datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+# Encoder settings per hardware mode, in order of preference: (decode args, encode args).
+HW_MODES = {
+    'nvenc': (['-hwaccel', 'cuda'],
+              ['-c:v', 'hevc_nvenc', '-preset', 'p4', '-b:v', '15M']),
+    'qsv': (['-hwaccel', 'qsv', '-hwaccel_output_format', 'qsv'],
+            ['-c:v', 'hevc_qsv', '-preset', 'slow', '-b:v', '15M']),
+    'vaapi': (['-hwaccel', 'vaapi', '-hwaccel_output_format', 'vaapi'],
+              ['-vf', 'format=nv12|vaapi,hwupload', '-c:v', 'hevc_vaapi', '-b:v', '15M']),
+    'videotoolbox': (['-hwaccel', 'videotoolbox'],
+                     ['-c:v', 'hevc_videotoolbox', '-b:v', '15M', '-tag:v', 'hvc1']),
+    'software': ([], ['-c:v', 'libx265', '-preset', 'slow', '-crf', '18']),
+}
+HW_REQUIREMENTS = {
+    'nvenc': ('cuda', 'hevc_nvenc'),
+    'qsv': ('qsv', 'hevc_qsv'),
+    'vaapi': ('vaapi', 'hevc_vaapi'),
+    'videotoolbox': ('videotoolbox', 'hevc_videotoolbox'),
+}
+# Global device setup, given once before the inputs. VAAPI encoders only take hardware frames, so its encode
+# args upload any frames the decoder left in system memory (software fallback, or the probe's test frame).
+HW_DEVICE_ARGS = {
+    'vaapi': ['-vaapi_device', '/dev/dri/renderD128'],
+}
+HW_PROBE_TIMEOUT = 15
+# CUDA device indices for NVDEC and NVENC; on multi-GPU machines they can differ to keep both engines busy.
+DECODE_GPU = 0
+ENCODE_GPU = 0
+# Seconds to wait for further titles before converting the ones already finished.
+BATCH_DELAY = 5.0
+# Milliseconds between status label refreshes (~30 Hz).
+STATUS_REFRESH_MS = 33
+# watchdog only reports file closes (inotify IN_CLOSE_WRITE) on Linux; elsewhere we wait for writes to stop.
+CLOSE_EVENTS_SUPPORTED = sys.platform.startswith('linux')
+# MakeMKV can pause for many seconds on a hard-to-read sector, so a title only counts as finished once its
+# size is unchanged across a whole quiet period with no modification events.
+WRITE_QUIET_PERIOD = 10.0
+# Seconds to wait, when the window closes, for cancelled rips to kill their child processes.
+RIP_SHUTDOWN_TIMEOUT = 10.0
+# Consumer NVENC parts limit concurrent encode sessions; encodes beyond this wait for a free session.
+MAX_ENCODER_SESSIONS = 3
+encoder_sessions = threading.Semaphore(MAX_ENCODER_SESSIONS)
+encoder_sessions_lock = threading.Lock()
+# Keeps Windows from flashing a console window for every child process.
+CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+# Only the end of a child's stderr is kept for error messages and progress; the rest is discarded as it streams.
+STDERR_CHUNK_BYTES = 1 << 16
+STDERR_TAIL_BYTES = 4096
+_FFMPEG_PROGRESS = re.compile(
+    rb'frame=\s*(?P<frame>\d+)\s+fps=\s*(?P<fps>[\d.]+)\s+[^\r\n]*?time=(?P<time>\d+:\d+:\d+\.\d+)')
 
-class MKVHandler(FileSystemEventHandler):
-    def __init__(self, output_folder, status_updater, logger):
-        super().__init__()
+@functools.lru_cache(maxsize=1)
+def _utc_second_prefix(sec):
+    tm = time.gmtime(sec)
+    return f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+
+def smpte_timecode_format(_ns=None):
+    """ Converts a time in nanoseconds since the epoch (default: now) to a UTC SMPTE timecode formatted string. """
+    ns = time.time_ns() if _ns is None else _ns
+    sec, rem = divmod(ns, 1_000_000_000)
+    return f"{_utc_second_prefix(sec)}.{rem // 1_000_000:03d}Z"
+
+class SMPTEFormatter(logging.Formatter):
+    """ Stamps each record with the SMPTE timecode of when it was created. """
+    def formatTime(self, record, datefmt=None):
+        return smpte_timecode_format(int(record.created * 1_000_000_000))
+
+def encoder_works(mode):
+    """ Encodes a single test frame; FFmpeg builds list hardware encoders whether or not the hardware exists. """
+    _, encode_args = HW_MODES[mode]
+    command = ['ffmpeg', '-hide_banner', '-loglevel', 'error', *HW_DEVICE_ARGS.get(mode, []),
+               '-f', 'lavfi', '-i', 'color=s=256x256', '-frames:v', '1', *encode_args, '-f', 'null', '-']
+    try:
+        return subprocess.run(command, capture_output=True, timeout=HW_PROBE_TIMEOUT,
+                              creationflags=CREATIONFLAGS).returncode == 0
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+
+def detect_hw_modes():
+    """ Probes FFmpeg once for working hardware decoders/encoders and returns the usable modes, best first. """
+    try:
+        hwaccels = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'], capture_output=True, text=True,
+                                  creationflags=CREATIONFLAGS).stdout.split()
+        encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True,
+                                  creationflags=CREATIONFLAGS).stdout
+    except OSError:
+        return ['software']
+    modes = [mode for mode, (hwaccel, encoder) in HW_REQUIREMENTS.items()
+             if hwaccel in hwaccels and f" {encoder} " in encoders and encoder_works(mode)]
+    return modes + ['software']
+
+def last_progress(buffer):
+    """ Returns the newest complete FFmpeg progress match in buffer, or None. FFmpeg ends those lines with \\r. """
+    end = max(buffer.rfind(b'\r'), buffer.rfind(b'\n'))
+    match = None
+    for match in _FFMPEG_PROGRESS.finditer(buffer, 0, max(end, 0)):
+        pass
+    return match
+
+async def run_command(command, on_progress=None, capture_stdout=False):
+    """ Runs a child process without a shell, passing each new FFmpeg progress match to on_progress.
+
+    Raises CalledProcessError carrying the end of stderr on failure (merged with stdout if capture_stdout,
+    for tools like makemkvcon that report errors there).
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if capture_stdout else subprocess.PIPE, creationflags=CREATIONFLAGS)
+    output = proc.stdout if capture_stdout else proc.stderr
+    # asyncio's StreamReader has no readinto(), so each chunk is a fresh bytes object; only the bounded
+    # tail is kept, which holds memory to STDERR_TAIL_BYTES however long the child runs.
+    tail = bytearray()
+    try:
+        while True:
+            chunk = await output.read(STDERR_CHUNK_BYTES)
+            if not chunk:
+                break
+            tail += chunk
+            del tail[:-STDERR_TAIL_BYTES]
+            if on_progress:
+                match = last_progress(tail)
+                if match:
+                    on_progress(match)
+        await proc.wait()
+    except asyncio.CancelledError:
+        # Nobody is waiting for the result any more, so don't leave the child running.
+        with contextlib.suppress(ProcessLookupError):
+            proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode:
+        stderr_tail = '\n'.join(tail.decode(errors='replace').strip().splitlines()[-5:])
+        raise subprocess.CalledProcessError(proc.returncode, command[0], stderr=stderr_tail)
+
+def release_page_cache(file_path):
+    """ Drops a converted MKV from the page cache so gigabytes of finished titles don't evict data still in use. """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def _acquire_encoder_sessions(count):
+    # Taking the sessions under a lock stops two batches each holding a partial set.
+    with encoder_sessions_lock:
+        for _ in range(count):
+            encoder_sessions.acquire()
+
+def _release_encoder_sessions(count):
+    for _ in range(count):
+        encoder_sessions.release()
+
+@contextlib.asynccontextmanager
+async def reserve_encoder_sessions(count):
+    """ Holds count encoder sessions, waiting for them on a helper thread so the event loop keeps running. """
+    acquired = concurrent.futures.Future()
+
+    def acquire():
+        _acquire_encoder_sessions(count)
+        acquired.set_result(None)
+
+    threading.Thread(target=acquire, daemon=True).start()
+    try:
+        await asyncio.shield(asyncio.wrap_future(acquired))
+    except asyncio.CancelledError:
+        # The helper thread still takes the sessions; hand them back as soon as it has them.
+        acquired.add_done_callback(lambda _: _release_encoder_sessions(count))
+        raise
+    try:
+        yield
+    finally:
+        _release_encoder_sessions(count)
+
+def remove_outputs(jobs):
+    """ Deletes whatever a failed or cancelled conversion wrote for jobs. """
+    for _, output_path in jobs:
+        if output_path.exists():
+            output_path.unlink()
+
+def build_ffmpeg_command(jobs, hw_mode):
+    """ Builds a single FFmpeg invocation converting every (input, output) pair in jobs. """
+    decode_args, encode_args = HW_MODES[hw_mode]
+    if hw_mode == 'nvenc':
+        decode_args = [*decode_args, '-hwaccel_device', str(DECODE_GPU)]
+        if DECODE_GPU == ENCODE_GPU:
+            # Frames stay in GPU memory; another GPU's encoder can only receive them through system memory.
+            decode_args += ['-hwaccel_output_format', 'cuda']
+        encode_args = [*encode_args, '-gpu', str(ENCODE_GPU)]
+    command = ['ffmpeg', *HW_DEVICE_ARGS.get(hw_mode, [])]
+    for file_path, _ in jobs:
+        command += [*decode_args, '-i', file_path]
+    for index, (_, output_path) in enumerate(jobs):
+        command += ['-map', f'{index}:v:0', '-map', f'{index}:a:0?', *encode_args, '-c:a', 'aac', '-b:a', '256k', output_path]
+    return command
+
+class MKVHandler(PatternMatchingEventHandler):
+    """ Converts MKVs as MakeMKV finishes them. Watchdog callbacks hand work to the asyncio loop; everything
+    from queue_file onwards runs on the loop thread. """
+    def __init__(self, output_folder, status_updater, logger, loop, pool, hw_mode='software'):
+        super().__init__(patterns=['*.mkv'], ignore_patterns=['*.tmp', '*.part'], ignore_directories=True)
+        self.loop = loop
+        self.pool = pool
         self.output_folder = output_folder
         self.status_updater = status_updater
         self.logger = logger
+        self.hw_mode = hw_mode
+        self.pending = collections.deque()
+        self.queued = set()
+        self.flush_handle = None
+        self.write_events = {}
+        self.outstanding = set()
+        self.idle = asyncio.Event()
+        # The loop only holds weak references to tasks, so running conversions are kept here.
+        self.tasks = set()
 
     def on_created(self, event):
-        if event.is_directory:
+        self.logger.info(f"Detected creation of {event.src_path}")
+        self.loop.call_soon_threadsafe(self.outstanding.add, event.src_path)
+        if not CLOSE_EVENTS_SUPPORTED:
+            self.write_events[event.src_path] = threading.Event()
+            # Its own thread, so long waits never hold a conversion worker.
+            threading.Thread(target=self.wait_for_writes_to_stop, args=(event.src_path,), daemon=True).start()
+
+    def on_modified(self, event):
+        write_event = self.write_events.get(event.src_path)
+        if write_event:
+            write_event.set()
+
+    def on_closed(self, event):
+        """ MakeMKV closing the file after writing means the title is complete. """
+        self.logger.info(f"File {event.src_path} is ready for processing.")
+        self.loop.call_soon_threadsafe(self.queue_file, event.src_path)
+
+    def wait_for_writes_to_stop(self, file_path):
+        """ Fallback for platforms without close events: the file is ready once writes and size changes stop. """
+        write_event = self.write_events[file_path]
+        size = None
+        try:
+            while True:
+                if write_event.wait(timeout=WRITE_QUIET_PERIOD):
+                    write_event.clear()
+                    continue
+                previous_size, size = size, os.stat(file_path).st_size
+                if size == previous_size:
+                    break
+        except OSError as e:
+            self.logger.error(f"Could not check {file_path}. Error: {e}")
+            self.loop.call_soon_threadsafe(self.forget, [file_path])
             return
-        if event.src_path.endswith('.mkv'):
-            self.logger.info(f"Detected creation of {event.src_path}")
-            if self.wait_until_file_is_ready(event.src_path):
-                self.process_file(event.src_path)
+        finally:
+            del self.write_events[file_path]
+        self.logger.info(f"File {file_path} is ready for processing.")
+        self.loop.call_soon_threadsafe(self.queue_file, file_path)
+
+    def queue_file(self, file_path):
+        """ Queues a finished MKV, restarting the countdown until the queued batch is converted. """
+        if file_path in self.queued:
+            return
+        self.queued.add(file_path)
+        self.pending.append(file_path)
+        if self.flush_handle:
+            self.flush_handle.cancel()
+        self.flush_handle = self.loop.call_later(BATCH_DELAY, self._flush)
+
+    def flush_now(self):
+        if self.flush_handle:
+            self.flush_handle.cancel()
+        self._flush()
+
+    def _flush(self):
+        batch = list(self.pending)
+        self.pending.clear()
+        self.flush_handle = None
+        for start in range(0, len(batch), MAX_ENCODER_SESSIONS):
+            task = self.loop.create_task(self.process_files(batch[start:start + MAX_ENCODER_SESSIONS]))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            task.add_done_callback(self._log_task_error)
+
+    def _log_task_error(self, task):
+        if not task.cancelled() and task.exception():
+            self.logger.error("Conversion failed unexpectedly", exc_info=task.exception())
+
+    async def wait_for_conversions(self):
+        """ Returns once every MKV seen so far has been converted or has failed. """
+        while self.outstanding:
+            self.idle.clear()
+            await self.idle.wait()
+
+    def output_path_for(self, file_path):
+        return pathlib.Path(self.output_folder) / f"{pathlib.Path(file_path).stem}_{time.strftime('%Y%m%d%H%M%S')}.mov"
+
+    async def process_files(self, file_paths):
+        """ Converts a batch of MKVs, sharing one FFmpeg process and codec setup between them.
+
+        If the shared process fails, each title is retried on its own so one bad title doesn't cost the rest.
+        """
+        jobs = [(file_path, self.output_path_for(file_path)) for file_path in file_paths]
+        try:
+            if self.hw_mode == 'nvenc' and _nvc_transcode.is_available():
+                for job in jobs:
+                    await self.convert_jobs([job])
+            elif not await self.convert_jobs(jobs) and len(jobs) > 1:
+                self.logger.info(f"Retrying {', '.join(file_paths)} one at a time")
+                for job in jobs:
+                    await self.convert_jobs([job])
+        finally:
+            self.forget(file_paths)
+
+    async def convert_jobs(self, jobs):
+        """ Runs one conversion for the (input, output) pairs in jobs. Returns False if it failed. """
+        file_paths = [file_path for file_path, _ in jobs]
+        names = ', '.join(os.path.basename(file_path) for file_path in file_paths)
+
+        def report_progress(match):
+            self.status_updater(f"Converting {names}: {match['time'].decode()} "
+                                f"(frame {int(match['frame'])}, {float(match['fps']):g} fps)")
 
-    def wait_until_file_is_ready(self, file_path):
-        """ Wait until the file can be opened, indicating it's fully written and closed. """
-        while True:
-            try:
-                with open(file_path, 'rb') as f:
-                    pass
-                self.logger.info(f"File {file_path} is ready for processing.")
-                return True
-            except IOError:
-                self.logger.info(f"Waiting for file {file_path} to be ready...")
-                time.sleep(10)
-
-    def process_file(self, file_path):
-        file_name = os.path.basename(file_path)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        output_file_name = f"{os.path.splitext(file_name)[0]}_{timestamp}.mov"
-        output_path = os.path.join(self.output_folder, output_file_name)
-        ffmpeg_command = f'ffmpeg -i "{file_path}" -c:v libx265 -preset slow -crf 18 -c:a aac -b:a 256k "{output_path}"'
         try:
-            subprocess.run(ffmpeg_command, shell=True, check=True)
+            if self.hw_mode == 'nvenc' and _nvc_transcode.is_available():
+                async with reserve_encoder_sessions(1):
+                    await self.transcode_in_process(*jobs[0])
+            else:
+                async with reserve_encoder_sessions(len(jobs)):
+                    await run_command(build_ffmpeg_command(jobs, self.hw_mode), report_progress)
+        except asyncio.CancelledError:
+            # The killed FFmpeg leaves truncated outputs that would pass for finished conversions.
+            remove_outputs(jobs)
+            raise
+        except (subprocess.CalledProcessError, RuntimeError, OSError) as e:
+            details = f"\n{e.stderr}" if isinstance(e, subprocess.CalledProcessError) else ""
+            self.logger.error(f"Failed to convert {', '.join(file_paths)}. Error: {e}{details}")
+            remove_outputs(jobs)
+            return False
+        for file_path, output_path in jobs:
+            release_page_cache(file_path)
             self.logger.info(f"Successfully converted {file_path} to {output_path}")
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"Failed to convert {file_path}. Error: {e}")
+        return True
+
+    def forget(self, file_paths):
+        """ Stops wait_for_conversions waiting on file_paths. """
+        self.outstanding.difference_update(file_paths)
+        self.idle.set()
 
-def execute_makemkv(input_drive, output_folder, logger):
+    async def transcode_in_process(self, file_path, output_path):
+        """ Encodes the video on the GPU with PyNvCodec, then has FFmpeg mux it with the source audio. """
+        # The .part suffix keeps the watcher off the intermediate if both folders are the same.
+        video_path = output_path.with_suffix('.mkv.part')
+        stop = threading.Event()
+        try:
+            transcoding = self.loop.run_in_executor(self.pool, _nvc_transcode.transcode,
+                                                    file_path, video_path, DECODE_GPU, ENCODE_GPU, stop)
+            try:
+                await asyncio.shield(transcoding)
+            except asyncio.CancelledError:
+                # Let the GPU work wind down before the session is released and the temp file removed.
+                stop.set()
+                with contextlib.suppress(Exception):
+                    await transcoding
+                raise
+            # -copyts keeps the source timestamps carried over by the transcode, so the audio stays in sync.
+            remux_command = ['ffmpeg', '-copyts', '-i', video_path, '-i', file_path,
+                             '-map', '0:v', '-map', '1:a:0?', '-c:v', 'copy', '-tag:v', 'hvc1',
+                             '-c:a', 'aac', '-b:a', '256k', output_path]
+            await run_command(remux_command)
+        finally:
+            if video_path.exists():
+                video_path.unlink()
+
+async def execute_makemkv(input_drive, output_folder, logger):
     logger.info(f"Starting MakeMKV to rip DVD into {output_folder}")
-    make_mkv_command = f"makemkvcon mkv disc:{input_drive} all \"{output_folder}\""
-    subprocess.run(make_mkv_command, shell=True, check=True)
+    make_mkv_command = ['makemkvcon', 'mkv', f'disc:{input_drive}', 'all', output_folder]
+    await run_command(make_mkv_command, capture_stdout=True)
     logger.info("MakeMKV operation completed successfully")
 
 class DVDConverterApp:
@@ -78,11 +418,31 @@ class DVDConverterApp:
         self.drive_index_var = tk.StringVar()
         tk.Entry(master, textvariable=self.drive_index_var, width=50).grid(row=2, column=1, padx=10)
 
+        tk.Label(master, text="Encoder:", fg='white', bg='gray12').grid(row=3, column=0, padx=10, pady=10)
+        self.hw_modes = detect_hw_modes()
+        self.hw_mode_var = tk.StringVar(value=self.hw_modes[0])
+        tk.OptionMenu(master, self.hw_mode_var, *self.hw_modes).grid(row=3, column=1, padx=10, sticky=tk.W)
+
         rip_button = tk.Button(master, text="RIP!", command=self.run_conversion, bg='green2', fg='black')
-        rip_button.grid(row=3, column=1, padx=10, pady=10, sticky=tk.W + tk.E)
+        rip_button.grid(row=4, column=1, padx=10, pady=10, sticky=tk.W + tk.E)
 
         self.status_label = tk.Label(master, text="Ready", fg="white", bg='gray12')
-        self.status_label.grid(row=4, columnspan=3, padx=10, pady=10)
+        self.status_label.grid(row=5, columnspan=3, padx=10, pady=10)
+        self.status_q = queue.Queue(maxsize=1)
+        self._pump_status()
+
+        # One observer for the app's lifetime; it only watches folders while a rip is active.
+        self.observer = Observer()
+        self.observer.start()
+        self._active_rips = 0
+        self._active_rips_lock = threading.Lock()
+        # (loop, task) of each running rip, so closing the window can cancel them.
+        self._rips = set()
+        self._rip_threads = []
+        self._closing = False
+        self._rip_serial = 0
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+        master.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def browse_folder(self, entry_var):
         folder_selected = filedialog.askdirectory()
@@ -98,29 +458,122 @@ class DVDConverterApp:
             return
         self.status_label.config(text="Preparing to process...")
         
-        log_filepath = os.path.join(mov_output, "process_log.log")
-        logging.basicConfig(filename=log_filepath, level=logging.INFO, format='%(asctime)s - %(message)s', datefmt=smpte_timecode_format())
-        logger = logging.getLogger()
-        
-        threading.Thread(target=self.background_conversion, args=(drive_index, mkv_output, mov_output, logger)).start()
-
-    def background_conversion(self, drive_index, mkv_output, mov_output, logger):
-        watchdog_thread = threading.Thread(target=self.setup_watchdog, args=(mkv_output, mov_output, logger))
-        watchdog_thread.start()
-        execute_makemkv(drive_index, mkv_output, logger)
-        watchdog_thread.join()
-        self.update_status_message("Conversion process is complete.")
-
-    def setup_watchdog(self, mkv_output, mov_output, logger):
-        event_handler = MKVHandler(mov_output, self.update_status_message, logger)
-        observer = Observer()
-        observer.schedule(event_handler, mkv_output, recursive=False)
-        observer.start()
-        observer.join()
+        logger, log_listener = self.open_rip_log(os.path.join(mov_output, "process_log.log"))
+
+        hw_mode = self.hw_mode_var.get()
+        logger.info(f"Using {hw_mode} encoder")
+
+        conversion = self.background_conversion(drive_index, mkv_output, mov_output, logger, hw_mode)
+        rip_thread = threading.Thread(target=self.run_rip, args=(conversion, logger, log_listener))
+        self._rip_threads = [thread for thread in self._rip_threads if thread.is_alive()] + [rip_thread]
+        rip_thread.start()
+
+    def open_rip_log(self, log_filepath):
+        """ Returns a logger writing only to log_filepath, so concurrent rips keep separate logs, and its listener.
+
+        Log calls only enqueue; the listener thread does the file I/O.
+        """
+        self._rip_serial += 1
+        logger = logging.getLogger(f"zac_the_ripper.rip{self._rip_serial}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        log_queue = queue.Queue(-1)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        file_handler = logging.FileHandler(log_filepath)
+        file_handler.setFormatter(SMPTEFormatter('%(asctime)s - %(message)s'))
+        log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        log_listener.start()
+        return logger, log_listener
+
+    def run_rip(self, conversion, logger, log_listener):
+        """ Rip thread body: runs the rip's event loop, then flushes and closes its log once nothing can log. """
+        try:
+            asyncio.run(conversion)
+        finally:
+            log_listener.stop()
+            for handler in [*logger.handlers, *log_listener.handlers]:
+                handler.close()
+            logger.handlers.clear()
+
+    async def background_conversion(self, drive_index, mkv_output, mov_output, logger, hw_mode):
+        """ Supervises one rip: MakeMKV and every FFmpeg child it triggers run as subprocesses of this loop. """
+        rip = (asyncio.get_running_loop(), asyncio.current_task())
+        with self._active_rips_lock:
+            if self._closing:
+                return
+            self._rips.add(rip)
+        event_handler = MKVHandler(mov_output, self.update_status_message, logger, asyncio.get_running_loop(),
+                                   self.pool, hw_mode)
+        watch = self.start_watching(event_handler, mkv_output)
+        try:
+            self.update_status_message("Ripping disc...")
+            try:
+                await execute_makemkv(drive_index, mkv_output, logger)
+                result = "Conversion process is complete."
+            except subprocess.CalledProcessError as e:
+                logger.error(f"MakeMKV failed. Error: {e}\n{e.stderr}")
+                result = "MakeMKV failed, see the log for details."
+                # Titles finished before the failure are still converted.
+                event_handler.flush_now()
+            except OSError as e:
+                logger.error(f"Could not run MakeMKV. Error: {e}")
+                result = "Could not run MakeMKV, see the log for details."
+            await event_handler.wait_for_conversions()
+        except asyncio.CancelledError:
+            # asyncio.run cancels the conversion tasks next, which kills their FFmpeg children.
+            logger.info("Rip cancelled because the application is closing")
+            return
+        finally:
+            self.stop_watching(event_handler, watch)
+            with self._active_rips_lock:
+                self._rips.discard(rip)
+        self.update_status_message(result)
+
+    def start_watching(self, event_handler, mkv_output):
+        with self._active_rips_lock:
+            self._active_rips += 1
+            return self.observer.schedule(event_handler, mkv_output, recursive=False)
+
+    def stop_watching(self, event_handler, watch):
+        """ Detaches a finished rip's handler and drops all watches once no rip needs them. """
+        with self._active_rips_lock:
+            self.observer.remove_handler_for_watch(event_handler, watch)
+            self._active_rips -= 1
+            if not self._active_rips:
+                self.observer.unschedule_all()
+
+    def on_close(self):
+        """ Cancels running rips and waits for their children to be killed before stopping the watcher. """
+        with self._active_rips_lock:
+            self._closing = True
+            rips = list(self._rips)
+        for loop, task in rips:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(task.cancel)
+        for rip_thread in self._rip_threads:
+            rip_thread.join(timeout=RIP_SHUTDOWN_TIMEOUT)
+        self.observer.stop()
+        self.pool.shutdown(wait=False)
+        self.master.destroy()
 
     def update_status_message(self, message):
-        if self.master:
-            self.master.after(100, lambda: self.status_label.config(text=message))
+        """ Safe from any thread. Only the newest message is kept until the label next refreshes. """
+        while True:
+            try:
+                self.status_q.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self.status_q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _pump_status(self):
+        try:
+            self.status_label.config(text=self.status_q.get_nowait())
+        except queue.Empty:
+            pass
+        self.master.after(STATUS_REFRESH_MS, self._pump_status)
 
 def main():
     root = tk.Tk()